@@ -1,4 +1,10 @@
 import copy
+import random
+import struct
+import sys
+import time
+from collections import deque
+from multiprocessing import resource_tracker, shared_memory
 
 
 class Orientation:
@@ -35,7 +41,213 @@ class Orientation:
             return []
         
         return [(x + dx, y + dy) for dx, dy in Orientation.offsets[direction]]
-        
+
+
+class PlacementTable:
+    """
+        PlacementTable: precomputed in-bounds L piece placements for one board size
+
+        Squares are numbered y * size + x, so a set of squares is an int bitmask and sorting
+        square numbers gives the same row-by-row order as scanning the game state.
+
+        Attributes:
+            - size: the board size the table was built for
+            - placements: list of (L_move, mask, positions) for every placement that fits on the board,
+              in the same (x, y, orientation) order that Board.get_legal_moves_reference scans them
+            - positions: dictionary mapping an L_move to its positions
+            - masks: dictionary mapping an L_move to its bitmask
+            - by_lowest_square: list indexed by square of (order, L_move, mask) for the placements whose lowest-numbered
+              square it is, so each placement is tested from exactly one of its squares
+            - square_positions: list mapping a square number to its (x, y) position
+
+        Functions:
+            for_size(size): returns the shared table for the given board size
+            mask_of(positions): returns the bitmask of the given in-bounds positions
+    """
+
+    # tables are built once per board size and shared by every board of that size
+    _tables = {}
+
+
+    def __init__(self, size):
+
+        self.size = size
+        self.placements = []
+        self.positions = {}
+        self.masks = {}
+        self.by_lowest_square = [[] for _ in range(size * size)]
+        self.square_positions = [(square % size, square // size) for square in range(size * size)]
+
+        for x in range(size):
+            for y in range(size):
+                for orientation in Orientation.orientations:
+
+                    positions = Orientation.get_offsets(x, y, orientation)
+
+                    # only placements that fit entirely on the board can ever be legal
+                    if all(0 <= L_x < size and 0 <= L_y < size for L_x, L_y in positions):
+                        L_move = ((x, y), orientation)
+                        mask = self.mask_of(positions)
+                        self.by_lowest_square[(mask & -mask).bit_length() - 1].append((len(self.placements), L_move, mask))
+                        self.placements.append((L_move, mask, positions))
+                        self.positions[L_move] = positions
+                        self.masks[L_move] = mask
+
+
+    @staticmethod
+    def for_size(size):
+        if size not in PlacementTable._tables:
+            PlacementTable._tables[size] = PlacementTable(size)
+        return PlacementTable._tables[size]
+
+
+    @staticmethod
+    def squares_of(mask):
+        """ returns the square numbers set in the mask, lowest first """
+        squares = []
+        while mask:
+            low_bit = mask & -mask
+            squares.append(low_bit.bit_length() - 1)
+            mask ^= low_bit
+        return squares
+
+
+    def mask_of(self, positions):
+        mask = 0
+        for x, y in positions:
+            if 0 <= x < self.size and 0 <= y < self.size:
+                mask |= 1 << (y * self.size + x)
+        return mask
+
+
+class Zobrist:
+    """
+        Zobrist: 64-bit random keys for hashing positions, one per (piece label, square) and per player to move
+
+        The keys come from a fixed seed, so every process computes the same hash for the same position.
+
+        Attributes:
+            - size: the board size the keys were drawn for
+            - square_keys: dictionary mapping a piece label ("L1", "L2", "N") to the keys of its squares (numbered y * size + x)
+            - side_keys: dictionary mapping an L piece label to the key of that player being to move
+            - max_node_key: key marking a position searched as a max node
+
+        Functions:
+            for_size(size): returns the shared keys for the given board size
+            hash_state(game_state): returns the hash of the pieces on the given grid
+    """
+
+    # keys are drawn once per board size and shared by every board of that size
+    _tables = {}
+
+
+    def __init__(self, size):
+
+        rng = random.Random(0x4C47414D45 + size)
+
+        self.size = size
+        self.square_keys = {label: [rng.getrandbits(64) for _ in range(size * size)] for label in ("L1", "L2", "N")}
+        self.side_keys = {label: rng.getrandbits(64) for label in ("L1", "L2")}
+        self.max_node_key = rng.getrandbits(64)
+
+
+    @staticmethod
+    def for_size(size):
+        if size not in Zobrist._tables:
+            Zobrist._tables[size] = Zobrist(size)
+        return Zobrist._tables[size]
+
+
+    def hash_state(self, game_state):
+        position_hash = 0
+        for y, row in enumerate(game_state):
+            for x, cell in enumerate(row):
+                if cell != ".":
+                    position_hash ^= self.square_keys[cell][y * self.size + x]
+        return position_hash
+
+
+class Renderer:
+    """
+        Renderer: interactive renderer that writes every message and board to the console as soon as it is given
+
+        Functions:
+            message(text, *args): outputs a message; args are %-formatted into the text only when it is rendered
+            board(game_state): outputs the given game state as a grid
+            flush(): writes out any output that is being held back
+            write(text): writes a line of rendered text
+            format_board(game_state): returns the given game state formatted as a grid
+    """
+
+    def message(self, text, *args):
+        self.write(text % args if args else text)
+
+
+    def board(self, game_state):
+        self.write(Renderer.format_board(game_state))
+
+
+    def flush(self):
+        # the interactive renderer writes immediately, so nothing is held back
+        pass
+
+
+    def write(self, text):
+        print(text)
+
+
+    @staticmethod
+    def format_board(game_state):
+
+        # width of the widest cell in each column
+        col_widths = [max(len(str(game_state[row][col])) for row in range(len(game_state))) for col in range(len(game_state[0]))]
+        rows = ["   ".join(str(cell).center(col_widths[col]) for col, cell in enumerate(row)) for row in game_state]
+
+        # trailing newline leaves a blank line after the board
+        return "\n".join(rows) + "\n"
+
+
+class BufferedRenderer(Renderer):
+    """
+        BufferedRenderer: renderer that collects a turn's output and writes it to the stream in a single call on flush
+
+        Attributes:
+            - stream: the file object the output is written to (default sys.stdout)
+            - lines: the rendered lines waiting to be written
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream if stream is not None else sys.stdout
+        self.lines = []
+
+
+    def write(self, text):
+        self.lines.append(text)
+
+
+    def flush(self):
+        if self.lines:
+            self.stream.write("\n".join(self.lines) + "\n")
+            self.stream.flush()
+            self.lines = []
+
+
+class NullRenderer(Renderer):
+    """
+        NullRenderer: renderer for headless runs; discards all output without formatting it
+    """
+
+    def message(self, text, *args):
+        pass
+
+
+    def board(self, game_state):
+        pass
+
+
+    def write(self, text):
+        pass
+
 
 class Board:
 
@@ -44,6 +256,9 @@ class Board:
         
         Attributes:
             - size: the size of the board (default 4)
+            - fast_engine: whether move generation uses the placement-table engine instead of the reference scans
+            - zobrist_hash: the cached Zobrist hash of the grid (None until computed; successors derive theirs incrementally)
+            - occupancy: the cached bitmasks of the squares holding "L1", "L2" and "N" (None until computed; fast successors update theirs)
             - game_state: the current state of the game board
             - L_pieces: dictionary mapping to L_piece objects
             - neutral_pieces: dictionary mapping to Neutral_Piece objects
@@ -56,12 +271,17 @@ class Board:
             clear_L_piece(self, player_label): removes the given player's L piece from the board
             clear_neutral_piece (self, neutral_coordinate): removes the neutral piece from the board
             move_neutral_piece (self, old_coordinate, new_coordinate): updates the neutral piece's attribute coordinate
+            init_variant_state(num_neutrals): initializes the starting layout of an NxN board with any number of neutral pieces
+            get_legal_moves(L_piece) / generate_successor(move, L_label): dispatch to the reference or fast engine
 
     """
 
-    def __init__(self, size = 4):
+    def __init__(self, size = 4, fast_engine = False):
 
         self.size = size
+        self.fast_engine = fast_engine
+        self.zobrist_hash = None
+        self.occupancy = None
         self.game_state = []
         self.L_pieces = {}
         self.neutral_pieces = {}
@@ -70,12 +290,14 @@ class Board:
 
     def init_board(self):
         """
-        initializes the game board with a 4x4 grid.
+        initializes the game board with a size x size grid.
 
         """
 
         # _ is a placeholder for the index; used when we don't need the index value
         self.game_state = [["." for _ in range(self.size)] for _ in range(self.size)]
+        self.zobrist_hash = None
+        self.occupancy = None
 
 
     def init_game_state(self, L1_coordinate = (1,3), L1_orientation = "E", L2_coordinate = (2, 0), L2_orientation = "W", neutral_positions = [(0,0), (3,3)]):
@@ -88,15 +310,49 @@ class Board:
         self.L_pieces["L1"] = L_Piece(L1_coordinate, L1_orientation, "L1")
         self.L_pieces["L2"] = L_Piece(L2_coordinate, L2_orientation, "L2")
 
-        # initialize the neutral pieces
+        # initialize the neutral pieces (N1, N2, ...)
         self.neutral_positions = neutral_positions
-        self.neutral_pieces ["N1"] = Neutral_Piece (neutral_positions [0], "N1")
-        self.neutral_pieces ["N2"] = Neutral_Piece (neutral_positions [1], "N2")
+        self.neutral_pieces = {}
+        for i, neutral_position in enumerate(neutral_positions):
+            self.neutral_pieces ["N" + str(i + 1)] = Neutral_Piece (neutral_position, "N" + str(i + 1))
 
         # update the grid
         self.update_grid()
 
 
+    def init_variant_state(self, num_neutrals = 2):
+        """
+        initializes the starting layout for a board of any size with the given number of neutral pieces;
+        on the default 4x4 board with 2 neutrals this is the standard starting position
+
+        """
+
+        if self.size < 4:
+            raise ValueError(f"board size must be at least 4, got {self.size}")
+
+        n = self.size
+
+        # L pieces start against opposite edges, as on the 4x4 board
+        L1_coordinate, L1_orientation = (1, n - 1), "E"
+        L2_coordinate, L2_orientation = (n - 2, 0), "W"
+        occupied = set(Orientation.get_offsets(L1_coordinate[0], L1_coordinate[1], L1_orientation))
+        occupied |= set(Orientation.get_offsets(L2_coordinate[0], L2_coordinate[1], L2_orientation))
+
+        # neutral pieces fill the corners first, then the remaining empty squares row by row
+        candidates = [(0, 0), (n - 1, n - 1), (n - 1, 0), (0, n - 1)] + [(x, y) for y in range(n) for x in range(n)]
+        neutral_positions = []
+        for position in candidates:
+            if len(neutral_positions) == num_neutrals:
+                break
+            if position not in occupied and position not in neutral_positions:
+                neutral_positions.append(position)
+
+        if len(neutral_positions) < num_neutrals:
+            raise ValueError(f"a {n}x{n} board has room for at most {len(neutral_positions)} neutral pieces")
+
+        self.init_game_state(L1_coordinate, L1_orientation, L2_coordinate, L2_orientation, neutral_positions)
+
+
     def update_grid(self):
         """
         updates the grid with the current game state
@@ -111,6 +367,10 @@ class Board:
         for piece in self.neutral_pieces.values():
             piece.place_on_board(self.game_state)
 
+        # the grid was changed in place, so the hash and occupancy are recomputed when next needed
+        self.zobrist_hash = None
+        self.occupancy = None
+
 
     def clear_L_piece(self, player_label):
         """
@@ -118,13 +378,16 @@ class Board:
 
         """
         
-        for i in range (4):
-            for j in range(4):
+        for i in range (self.size):
+            for j in range(self.size):
 
                 # if position contains the player's L piece, clear it
                 if self.game_state[i][j] == player_label:
                     self.game_state[i][j] = "."
 
+        self.zobrist_hash = None
+        self.occupancy = None
+
 
     def clear_neutral_piece (self, neutral_coordinate):
         """
@@ -135,6 +398,8 @@ class Board:
         # clear the position of the neutral piece
         x, y = neutral_coordinate
         self.game_state[y][x] = "."
+        self.zobrist_hash = None
+        self.occupancy = None
     
 
     def move_neutral_piece (self, old_coordinate, new_coordinate):
@@ -155,6 +420,18 @@ class Board:
 
         """
 
+        if self.fast_engine:
+            return self.get_legal_moves_fast(L_piece)
+
+        return self.get_legal_moves_reference(L_piece)
+
+
+    def get_legal_moves_reference(self, L_piece):
+        """
+        returns all the legal moves of a given L piece by simulating every L move on a copy of the grid
+
+        """
+
         def is_within_grid(x, y):
             """ helper function to check if a position is within the grid """
             return 0 <= x < self.size and 0 <= y < self.size
@@ -224,8 +501,8 @@ class Board:
             simulate_place_L_piece (simulated_state, L_move, L_piece.label)
 
             # get the positions of neutral and empty squares in the simulated state
-            sim_neutral_positions = [(x, y) for y in range(4) for x in range(4) if simulated_state[y][x] == "N"]
-            sim_empty_positions = [(x, y) for y in range(4) for x in range(4) if simulated_state[y][x] == "."]
+            sim_neutral_positions = [(x, y) for y in range(self.size) for x in range(self.size) if simulated_state[y][x] == "N"]
+            sim_empty_positions = [(x, y) for y in range(self.size) for x in range(self.size) if simulated_state[y][x] == "."]
 
             legal_neutral_moves = []
 
@@ -250,18 +527,100 @@ class Board:
         return legal_moves
 
 
+    def get_legal_moves_fast(self, L_piece):
+        """
+        returns the same legal moves as get_legal_moves_reference, in the same order, using the placement table:
+        only placements anchored on a free square are tested, and each L move only filters the free squares
+        instead of copying and rescanning the grid
+
+        """
+
+        size = self.size
+        label = L_piece.label
+        table = PlacementTable.for_size(size)
+        square_positions = table.square_positions
+
+        # squares the L piece may use (empty or its own) and the neutral pieces, in row-by-row order
+        occupancy = self.occupancy_masks()
+        blocked_mask = occupancy["N"]
+        for other_label, mask in occupancy.items():
+            if other_label != label:
+                blocked_mask |= mask
+        free_mask = ((1 << (size * size)) - 1) & ~blocked_mask
+        free_squares = [(1 << square, square_positions[square]) for square in PlacementTable.squares_of(free_mask)]
+        neutral_positions = [square_positions[square] for square in PlacementTable.squares_of(occupancy["N"])]
+
+        # every neutral move, built once per call and shared by all the L moves that leave its target square empty
+        neutral_moves = [[(bit, (neutral_pos, empty_pos)) for bit, empty_pos in free_squares] for neutral_pos in neutral_positions]
+
+        curr_mask = table.mask_of(L_piece.get_current_positions())
+
+        # conditions: unoccupied and at least one new position; a placement on a blocked square is never looked at
+        candidates = []
+        for bit, _ in free_squares:
+            for order, L_move, mask in table.by_lowest_square[bit.bit_length() - 1]:
+                if mask & free_mask == mask and mask & ~curr_mask:
+                    candidates.append((order, L_move, mask))
+
+        # back in the reference scan order
+        candidates.sort()
+
+        legal_moves = []
+        for _, L_move, mask in candidates:
+
+            # after the move, the empty squares are the free squares the L piece does not cover
+            for neutral_row in neutral_moves:
+                legal_moves.extend([(L_move, neutral_move) for bit, neutral_move in neutral_row if not bit & mask])
+
+            # option to not move the neutral piece
+            legal_moves.append ((L_move, None))
+
+        return legal_moves
+
+
+    def occupancy_masks (self):
+        """
+        returns a dictionary mapping "L1", "L2" and "N" to the bitmask of the squares they occupy
+
+        """
+
+        if self.occupancy is None:
+            occupancy = {"L1": 0, "L2": 0, "N": 0}
+            for y, row in enumerate(self.game_state):
+                for x, cell in enumerate(row):
+                    if cell != ".":
+                        occupancy[cell] = occupancy.get(cell, 0) | 1 << (y * self.size + x)
+            self.occupancy = occupancy
+
+        return self.occupancy
+
+
     def generate_successor (self, move, L_label):
         """
         returns the successor board after the given move is executed
 
         """
 
+        if self.fast_engine:
+            return self.generate_successor_fast(move, L_label)
+
+        return self.generate_successor_reference(move, L_label)
+
+
+    def generate_successor_reference (self, move, L_label):
+        """
+        returns the successor board after the given move is executed, working on a deep copy of the board
+
+        """
+
         # create a deep copy of the current board
         successor_board = copy.deepcopy(self)
+        successor_board.zobrist_hash = self.successor_hash(move, L_label)
+        successor_board.occupancy = None
 
         # clear the current player's L piece from the successor board
-        for i in range(4):
-            for j in range(4):
+        for i in range(self.size):
+            for j in range(self.size):
                 if successor_board.game_state[i][j] == L_label:
                     successor_board.game_state[i][j] = "."
 
@@ -275,10 +634,14 @@ class Board:
         L_positions = Orientation.get_offsets(new_L_coordinate[0], new_L_coordinate[1], new_orientation)
 
         # place the L piece on the successor board
-        for i in range (4):
-            for j in range (4):
+        for i in range (self.size):
+            for j in range (self.size):
                 if (i, j) in L_positions:
                     successor_board.game_state[j][i] = L_label
+
+        # keep the successor's piece objects in step with its grid
+        if L_label in successor_board.L_pieces:
+            successor_board.L_pieces[L_label].move(new_L_coordinate, new_orientation)
         
 
         if neutral_move:
@@ -288,18 +651,134 @@ class Board:
             new_x, new_y = new_neutral_coordinate
 
             # clear the old neutral piece from the board
-            for i in range(4):
-                for j in range(4):
+            for i in range(self.size):
+                for j in range(self.size):
                     if (i, j) == old_neutral_coordinate:
                         successor_board.game_state[j][i] = "."
 
             # place the neutral piece on the successor board
             successor_board.game_state [new_y][new_x] = "N"
+            successor_board.move_neutral_piece(old_neutral_coordinate, new_neutral_coordinate)
         
         # return the successor board
         return successor_board
 
+
+    def generate_successor_fast (self, move, L_label):
+        """
+        returns the same successor board as generate_successor_reference without deep copying:
+        the grid is copied row by row (clearing the L piece on the way) and only the piece objects are duplicated
+
+        """
+
+        size = self.size
+        L_move, neutral_move = move
+        new_L_coordinate, new_orientation = L_move
+
+        # copy the grid, clearing the current player's L piece
+        game_state = [["." if cell == L_label else cell for cell in row] for row in self.game_state]
+
+        # place the L piece
+        table = PlacementTable.for_size(size)
+        L_positions = table.positions.get(L_move)
+        if L_positions is None:
+            L_positions = Orientation.get_offsets(new_L_coordinate[0], new_L_coordinate[1], new_orientation)
+        for x, y in L_positions:
+            if 0 <= x < size and 0 <= y < size:
+                game_state[y][x] = L_label
+
+        # optionally move a neutral piece
+        if neutral_move:
+            (old_x, old_y), (new_x, new_y) = neutral_move
+            if 0 <= old_x < size and 0 <= old_y < size:
+                game_state[old_y][old_x] = "."
+            game_state[new_y][new_x] = "N"
+
+        # shallow copy of the board; only the grid and the piece objects change between successors
+        successor_board = Board.__new__(Board)
+        successor_board.__dict__.update(self.__dict__)
+        successor_board.game_state = game_state
+        successor_board.L_pieces = {label: L_Piece(piece.coordinate, piece.orientation, piece.label) for label, piece in self.L_pieces.items()}
+        successor_board.neutral_pieces = {label: Neutral_Piece(piece.coordinate, piece.label) for label, piece in self.neutral_pieces.items()}
+        successor_board.neutral_positions = list(self.neutral_positions)
+        successor_board.zobrist_hash = self.successor_hash(move, L_label)
+
+        # update the occupancy masks with the squares that changed
+        if self.occupancy is not None:
+            occupancy = dict(self.occupancy)
+            occupancy[L_label] = table.masks[L_move] if L_move in table.masks else table.mask_of(L_positions)
+            if neutral_move:
+                occupancy["N"] = (occupancy["N"] & ~table.mask_of([neutral_move[0]])) | table.mask_of([neutral_move[1]])
+            successor_board.occupancy = occupancy
+
+        # keep the successor's piece objects in step with its grid
+        if L_label in successor_board.L_pieces:
+            successor_board.L_pieces[L_label].move(new_L_coordinate, new_orientation)
+        if neutral_move:
+            successor_board.move_neutral_piece(neutral_move[0], neutral_move[1])
+
+        return successor_board
+
     
+    def position_key (self):
+        """
+        returns a string identifying the position on the grid (cell labels are prefix-free, so they are joined without separators)
+
+        """
+
+        return "".join(cell for row in self.game_state for cell in row)
+
+
+    def position_hash (self):
+        """
+        returns the 64-bit Zobrist hash of the position on the grid
+
+        """
+
+        if self.zobrist_hash is None:
+            self.zobrist_hash = Zobrist.for_size(self.size).hash_state(self.game_state)
+
+        return self.zobrist_hash
+
+
+    def successor_hash (self, move, L_label):
+        """
+        returns the hash of the position after the given move by updating this position's hash with the squares that change
+        (None if this position's hash has not been computed)
+
+        """
+
+        if self.zobrist_hash is None:
+            return None
+
+        zobrist = Zobrist.for_size(self.size)
+        L_keys = zobrist.square_keys[L_label]
+        L_move, neutral_move = move
+        (x, y), orientation = L_move
+        successor_hash = self.zobrist_hash
+
+        # take the L piece off its current squares and put it on the new ones
+        for L_x, L_y in self.L_pieces[L_label].get_current_positions():
+            successor_hash ^= L_keys[L_y * self.size + L_x]
+        for L_x, L_y in Orientation.get_offsets(x, y, orientation):
+            successor_hash ^= L_keys[L_y * self.size + L_x]
+
+        if neutral_move:
+            (old_x, old_y), (new_x, new_y) = neutral_move
+            successor_hash ^= zobrist.square_keys["N"][old_y * self.size + old_x] ^ zobrist.square_keys["N"][new_y * self.size + new_x]
+
+        return successor_hash
+
+
+    def repetition_key (self, label_to_move):
+        """
+        returns the hash of the position together with the player to move; a position repeats when this key does
+
+        """
+
+        return self.position_hash() ^ Zobrist.for_size(self.size).side_keys[label_to_move]
+
+
     def is_terminal (self):
         """
         checks is the game is over by checking if either player has no legal moves
@@ -313,16 +792,16 @@ class Board:
         return len(player1_legal_moves) == 0 or len(player2_legal_moves) == 0
 
 
-    def display_board(self):
+    def display_board(self, renderer=None):
         """
-        displays the current game board
+        displays the current game board through the given renderer (the console if none is given)
 
         """
 
-        col_widths = [max(len(str(self.game_state[row][col])) for row in range(len(self.game_state))) for col in range(len(self.game_state[0]))]
-        for row in self.game_state:
-            print("   ".join(str(cell).center(col_widths[col]) for col, cell in enumerate(row)))
-        print()
+        if renderer is None:
+            renderer = Renderer()
+
+        renderer.board(self.game_state)
 
 
 class L_Piece:
@@ -397,9 +876,10 @@ class Neutral_Piece:
 
 class Player:
 
-    def __init__(self, name, L_piece):
+    def __init__(self, name, L_piece, renderer=None):
         self.name = name
         self.L_piece = L_piece
+        self.renderer = renderer if renderer is not None else Renderer()
     
 
     def make_move (self, board):
@@ -407,10 +887,13 @@ class Player:
         Executes a move for the player by interacting with the board.
 
         """
-        print(f"{self.name}'s turn to make a move'")
+        self.renderer.message("%s's turn to make a move'", self.name)
 
         # Display the current board before the move
-        board.display_board()
+        board.display_board(self.renderer)
+
+        # the prompts below need the board on screen
+        self.renderer.flush()
 
         # check that the move is valid
         legal_moves = board.get_legal_moves (self.L_piece)
@@ -471,7 +954,8 @@ class Player:
         self.L_piece.place_on_board(board.game_state)
 
         # display board after L piece move
-        board.display_board()
+        board.display_board(self.renderer)
+        self.renderer.flush()
 
         # get legal moves for the neutral piece after the L piece move
         legal_neutral_moves = [(move[1]) for move in legal_moves if move[0] == ((new_x, new_y), new_orientation)]
@@ -573,153 +1057,1164 @@ class Player:
 
         # Update and display the board after the move
         board.update_grid()
-        print("Updated board after move:")
-        board.display_board()
+        self.renderer.message("Updated board after move:")
+        board.display_board(self.renderer)
 
 
-class MinimaxAgent:
+class ByteBoundedCache:
     """
-    MinimaxAgent: represents an AI agent that uses the minimax algorithm to make moves
+    ByteBoundedCache: dictionary kept within an estimated size in bytes by evicting its oldest entries
 
     Attributes:
-        - name: the name of the AI agent
-        - L_piece: the L piece controlled by the AI agent
-        - depth: the depth to search in the minimax tree
+        - max_bytes: maximum estimated size of the cache in bytes (None = unlimited)
+        - entries: dictionary mapping a key to (value, estimated entry bytes), oldest first
+        - bytes: current estimated size of the cache in bytes
 
     Functions:
-        evaluation_function(L_piece): evaluates game state to return a score
-        get_action(board): returns the minimax action from the current game state
-        find_max_score(board, depth, player_L_labels, alpha, beta): returns the maximum score for the current player
-        find_min_score(board, depth, player_L_labels, alpha, beta): returns the minimum score for the opponent player
+        entry_bytes(*objects): returns a rough estimate of the size of an entry made of the given objects
+        get(key): returns the value stored for the key, or None
+        put(key, value, entry_bytes): stores a value; returns False if older entries were evicted or the value did not fit
+        evict(max_bytes): evicts the oldest entries until the cache holds at most max_bytes
     """
 
-    def __init__(self, name, L_piece, depth):
-        
-        self.name = name
-        self.L_piece = L_piece
-        self.depth = depth
+    # rough per-entry cost of a dictionary slot (hash, key and value pointers plus spare capacity)
+    slot_bytes = 64
 
 
-    def evaluation_function (self, L_piece):
-        """
-        evaluates game state to return a score
-        """
-        # evaluate game state based on number of middle 4 squares occupied by an L piece
-        middle_squares = [(1, 1), (1, 2), (2, 1), (2, 2)]
-        L_piece_positions = L_piece.get_current_positions()
-        return sum(1 for x, y in middle_squares if (x, y) in L_piece_positions)
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self.bytes = 0
 
 
-    def get_action(self, board):
-        """
-        returns the minimax action from the current game state
-        """
+    def __len__(self):
+        return len(self.entries)
 
-        alpha = float('-inf')
-        beta = float('inf')
-        
-        # which L piece is the max player
-        max_player_L_piece_label = self.L_piece.label
-        if max_player_L_piece_label == "L1":
-            min_player_L_piece_label = "L2"
-        elif max_player_L_piece_label == "L2":
-            min_player_L_piece_label = "L1"
 
-        else: 
-            raise ValueError (f"invalid label: {max_player_L_piece_label}")
+    @staticmethod
+    def entry_bytes(*objects):
+        return sum(sys.getsizeof(item) for item in objects) + ByteBoundedCache.slot_bytes
 
-        # dictionary to map player labels to L piece labels
-        player_L_labels = {"max": max_player_L_piece_label, "min": min_player_L_piece_label}
 
-        # initialize list of legal moves & scores
-        moves = board.get_legal_moves (self.L_piece)
-        successor_boards = [board.generate_successor (move, player_L_labels["max"]) for move in moves]
+    def get(self, key):
+        entry = self.entries.get(key)
+        return None if entry is None else entry[0]
 
-        # list of scores
-        scores = [self.find_min_score (board, self.depth, player_L_labels, alpha, beta) for board in successor_boards]     # list of scores for each move
 
-        # pick action w/ max score
-        best_score = max (scores)
-        best_action = moves[scores.index(best_score)]
+    def put(self, key, value, entry_bytes):
 
-        # print(f"Scores for each move:", scores)
-        # print(f"Best action chosen: {best_action}, Best score: {best_score}")
+        # replacing an entry frees its bytes first
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key)[1]
 
-        return best_action
+        fits = True
+        if self.max_bytes is not None:
+            if entry_bytes > self.max_bytes:
+                return False
+            fits = self.bytes + entry_bytes <= self.max_bytes
+            self.evict(self.max_bytes - entry_bytes)
 
+        self.entries[key] = (value, entry_bytes)
+        self.bytes += entry_bytes
 
-    def find_max_score(self, board, depth, player_L_labels, alpha, beta):
-        # check if the game is over or if the depth limit is reached
-        if depth == 0 or board.is_terminal():
-            return self.evaluation_function(board.L_pieces[player_L_labels["max"]])
+        return fits
 
-        max_score = float('-inf')
 
-        # get the max score for each successor
-        for move in board.get_legal_moves(board.L_pieces[player_L_labels["max"]]):     
-            successor = board.generate_successor(move, player_L_labels["min"])
-            max_score = max(max_score, self.find_min_score(successor, depth, player_L_labels, alpha, beta))
+    def evict(self, max_bytes):
+        while self.bytes > max_bytes:
+            oldest_key = next(iter(self.entries))
+            self.bytes -= self.entries.pop(oldest_key)[1]
 
-        # alpha-beta pruning
-        if max_score >= beta:
-            return max_score
-        alpha = max(alpha, max_score)
 
-        return max_score
+class SearchBudget:
+    """
+    SearchBudget: hard limits for a single search; None means unlimited
 
+    Attributes:
+        - max_nodes: maximum number of nodes visited per move
+        - max_cache_bytes: maximum estimated size of the score cache and the evaluator's feature cache together, in bytes
+        - max_depth: maximum recursion depth in plies below the root
+    """
 
-    def find_min_score(self, board, depth, player_L_labels, alpha, beta):
+    def __init__(self, max_nodes=None, max_cache_bytes=None, max_depth=None):
+        self.max_nodes = max_nodes
+        self.max_cache_bytes = max_cache_bytes
+        self.max_depth = max_depth
 
-        if depth == 0 or board.is_terminal():
-            return self.evaluation_function(board.L_pieces[player_L_labels["min"]])
 
-        min_score = float('inf')
+class SearchBudgetExceeded(Exception):
+    """
+    raised inside a budgeted search when the node budget runs out
+    """
 
-        for action in board.get_legal_moves(board.L_pieces[player_L_labels["min"]]):       # agent_index = L_piece (object)
 
-            successor = board.generate_successor(action, player_L_labels["min"])  # agent_index = player_name ("AI", "AI1", etc.)
+class SearchReport:
+    """
+    SearchReport: how much of its budget a single search used
 
-            # need this for l game? this was for ghosts in pacman\
-            min_score = min(min_score, self.find_max_score(successor, depth - 1, player_L_labels, alpha, beta))
+    Attributes:
+        - budget: the SearchBudget the search ran under
+        - nodes: number of nodes visited
+        - cache_hits: number of nodes answered from the score cache
+        - cache_bytes: peak estimated size of the score cache (or of the proof search tree, whichever was larger) plus the
+          evaluator's feature cache, in bytes
+        - evaluator_bytes: peak estimated size of the evaluator's feature cache in bytes (included in cache_bytes)
+        - prover_nodes: number of nodes the proof search created (included in nodes)
+        - prover_bytes: estimated peak size of the proof search tree in bytes
+        - max_ply: deepest recursion depth reached in plies
+        - completed_depth: deepest search depth that finished for every root move (-1 if none did)
+        - limits_hit: set of the limits that were reached ("nodes", "cache_bytes", "depth")
 
-        if min_score <= alpha:
-            return min_score
-        beta = min(beta, min_score)
+    Functions:
+        usage(): returns the fraction of each limit that was used (None for unlimited)
+    """
 
-        return min_score
+    def __init__(self, budget):
+        self.budget = budget
+        self.nodes = 0
+        self.cache_hits = 0
+        self.cache_bytes = 0
+        self.evaluator_bytes = 0
+        self.prover_nodes = 0
+        self.prover_bytes = 0
+        self.max_ply = 0
+        self.completed_depth = -1
+        self.limits_hit = set()
 
-class Game:
 
-    def __init__(self, mode='human_vs_human', depth=0):
-        
-        self.mode = mode
-        self.board = Board()
-        self.board.init_board()
-        self.board.init_game_state()
-        self.current_player_index = 0
-        self.players = []
+    def usage(self):
 
+        def fraction(used, limit):
+            return None if limit is None else used / limit if limit else 1.0
 
-        if self.mode == 'human_vs_human':
-            self.players = [
-                Player("player1", self.board.L_pieces["L1"]),
-                Player("player2", self.board.L_pieces["L2"])
-            ]
-        elif self.mode == 'human_vs_ai':
-            self.players = [
-                Player("human", self.board.L_pieces["L1"]),
-                MinimaxAgent("AI", self.board.L_pieces["L2"], depth)
-            ]
-        elif self.mode == 'ai_vs_ai':
-            self.players = [
-                MinimaxAgent("AI1", self.board.L_pieces["L1"], depth),
-                MinimaxAgent("AI2", self.board.L_pieces["L2"], depth)
-            ]
-        else:
-            raise ValueError("Invalid game mode. Choose from 'human_vs_human', 'human_vs_ai', or 'ai_vs_ai'.")
+        return {
+            "nodes": fraction(self.nodes, self.budget.max_nodes),
+            "cache_bytes": fraction(self.cache_bytes, self.budget.max_cache_bytes),
+            "depth": fraction(self.max_ply, self.budget.max_depth)
+        }
 
 
-    def switch_player(self):
+    def __str__(self):
+        usage = ", ".join(f"{limit} {'unlimited' if used is None else f'{used:.0%}'}" for limit, used in self.usage().items())
+        hit = ", ".join(sorted(self.limits_hit)) or "none"
+        return (f"{self.nodes} nodes, {self.cache_hits} cache hits, {self.cache_bytes} cache bytes ({self.evaluator_bytes} evaluator), "
+                f"prover {self.prover_nodes} nodes {self.prover_bytes} bytes, ply {self.max_ply}, completed depth {self.completed_depth}; budget used: {usage}; limits hit: {hit}")
+
+
+class ProofResult:
+    """
+    ProofResult: outcome of a proof-number search
+
+    Attributes:
+        - status: "proven" (forced win), "disproven" (no forced win) or "unknown" (a node, memory or depth limit decided it)
+        - line: for a proven win, the moves from the root to the position where the defender has no legal move
+        - nodes: number of nodes the search created
+        - bytes: estimated peak size of the search tree in bytes
+        - tree: for a proven win, the root of the proof tree (every defender reply is answered in it), else None
+        - limit: for an unknown result, the limit that stopped the search: "prover" (the search's own max_nodes),
+          "nodes" (the caller's max_nodes), "bytes" (the caller's max_bytes) or "depth" (no win within max_depth plies,
+          but lines were cut short there)
+    """
+
+    def __init__(self, status, line, nodes, bytes=0, tree=None, limit=None):
+        self.status = status
+        self.line = line
+        self.nodes = nodes
+        self.bytes = bytes
+        self.tree = tree
+        self.limit = limit
+
+
+class _ProofNode:
+    """ a node of the proof-number search tree; OR nodes have the attacker to move, AND nodes the defender """
+
+    __slots__ = ("board", "move", "is_or", "parent", "children", "proof", "disproof", "depth", "key")
+
+    def __init__(self, board, move, is_or, parent, depth):
+        self.board = board
+        self.move = move
+        self.is_or = is_or
+        self.parent = parent
+        self.children = []
+        self.proof = 1
+        self.disproof = 1
+        self.depth = depth
+        self.key = board.position_key()
+
+
+class ProofNumberSearch:
+    """
+    ProofNumberSearch: proof-number search that proves or disproves a forced win, i.e. that the attacker can always
+    reach a position where the defender has no legal L placement
+
+    Repeated positions along a line count as not won. Lines are cut max_depth plies below the root; when no win is
+    found and a line was cut, the result is unknown rather than disproven.
+
+    Attributes:
+        - max_nodes: maximum number of nodes the search may create
+        - max_depth: maximum line length in plies (None = unlimited)
+
+    Functions:
+        prove(board, attacker_label, max_nodes, max_bytes): returns a ProofResult for the attacker moving first on the given board,
+        creating at most the smaller of self.max_nodes and max_nodes nodes and an estimated max_bytes of tree
+        node_bytes(board): returns an upper estimate of the memory one search node takes on boards like the given one
+    """
+
+    def __init__(self, max_nodes=20000, max_depth=None):
+        self.max_nodes = max_nodes
+        self.max_depth = max_depth
+        self._depth_cut = False
+
+
+    def prove(self, board, attacker_label, max_nodes=None, max_bytes=None):
+        """
+        returns a ProofResult for the attacker moving first on the given board
+
+        """
+
+        defender_labels = [label for label in board.L_pieces if label != attacker_label]
+        if attacker_label not in board.L_pieces or len(defender_labels) != 1:
+            raise ValueError (f"invalid label: {attacker_label}")
+
+        labels = {True: attacker_label, False: defender_labels[0]}
+
+        # the tightest of the node limits, counting every node as holding a board
+        node_bytes = self.node_bytes(board)
+        node_limit, limit = self.max_nodes, "prover"
+        if max_nodes is not None and max_nodes < node_limit:
+            node_limit, limit = max_nodes, "nodes"
+        if max_bytes is not None and max_bytes // node_bytes < node_limit:
+            node_limit, limit = max_bytes // node_bytes, "bytes"
+
+        if node_limit < 1:
+            return ProofResult("unknown", [], 0, 0, None, limit)
+
+        self._depth_cut = False
+        root = _ProofNode(board, None, True, None, 0)
+        self._set_leaf_numbers(root, labels)
+        nodes = 1
+
+        while root.proof != 0 and root.disproof != 0 and nodes < node_limit:
+
+            # descend to the most-proving node
+            node = root
+            while node.children:
+                if node.is_or:
+                    node = min(node.children, key=lambda child: child.proof)
+                else:
+                    node = min(node.children, key=lambda child: child.disproof)
+
+            # expand it, unless its children would go over the limit
+            mover_label = labels[node.is_or]
+            moves = node.board.get_legal_moves(node.board.L_pieces[mover_label])
+            if nodes + len(moves) > node_limit:
+                break
+
+            for move in moves:
+                child = _ProofNode(node.board.generate_successor(move, mover_label), move, not node.is_or, node, node.depth + 1)
+                self._set_leaf_numbers(child, labels)
+                node.children.append(child)
+                nodes += 1
+
+            # only the leaves need their boards
+            node.board = None
+
+            # back the numbers up to the root
+            while node is not None:
+                self._set_inner_numbers(node)
+                node = node.parent
+
+        if root.proof == 0:
+            return ProofResult("proven", self._proof_line(root), nodes, nodes * node_bytes, root)
+        if root.disproof == 0 and self._depth_cut:
+            return ProofResult("unknown", [], nodes, nodes * node_bytes, None, "depth")
+        if root.disproof == 0:
+            return ProofResult("disproven", [], nodes, nodes * node_bytes)
+        return ProofResult("unknown", [], nodes, nodes * node_bytes, None, limit)
+
+
+    @staticmethod
+    def node_bytes(board):
+        """ returns an upper estimate of the memory one search node takes: the node, its move and a board like the given one """
+
+        size = sys.getsizeof
+        board_bytes = size(board) + size(board.__dict__) + size(board.game_state) + sum(size(row) for row in board.game_state)
+        for pieces in (board.L_pieces, board.neutral_pieces):
+            board_bytes += size(pieces) + sum(size(piece) + size(piece.__dict__) for piece in pieces.values())
+        board_bytes += size(board.neutral_positions) + size(board.position_key())
+        if board.occupancy is not None:
+            board_bytes += size(board.occupancy)
+
+        # node slots plus the move: ((x, y), orientation) and ((old_x, old_y), (new_x, new_y)) tuples
+        return board_bytes + size(_ProofNode.__new__(_ProofNode)) + 6 * size((0, 0))
+
+
+    def _set_leaf_numbers(self, node, labels):
+        """ sets the proof and disproof numbers of an unexpanded node """
+
+        # a repetition of an earlier position with the same player to move: not a win
+        ancestor = node.parent
+        while ancestor is not None:
+            if ancestor.is_or == node.is_or and ancestor.key == node.key:
+                node.proof, node.disproof = float('inf'), 0
+                return
+            ancestor = ancestor.parent
+
+        # the player to move has no legal moves: proven if it is the defender, disproven if it is the attacker
+        L_moves = set(move[0] for move in node.board.get_legal_moves(node.board.L_pieces[labels[node.is_or]]))
+        if not L_moves:
+            node.proof, node.disproof = (float('inf'), 0) if node.is_or else (0, float('inf'))
+            node.board = None
+            return
+
+        # a line that has not ended by max_depth is cut short: not a win within the limit
+        if self.max_depth is not None and node.depth >= self.max_depth:
+            node.proof, node.disproof = float('inf'), 0
+            self._depth_cut = True
+            return
+
+        # otherwise the fewer L moves the player to move has, the easier the node is to solve
+        if node.is_or:
+            node.proof, node.disproof = 1, len(L_moves)
+        else:
+            node.proof, node.disproof = len(L_moves), 1
+
+
+    def _set_inner_numbers(self, node):
+        """ sets the proof and disproof numbers of an expanded node from its children and drops subtrees no longer needed """
+
+        if not node.children:
+            return
+
+        if node.is_or:
+            node.proof = min(child.proof for child in node.children)
+            node.disproof = sum(child.disproof for child in node.children)
+        else:
+            node.proof = sum(child.proof for child in node.children)
+            node.disproof = min(child.disproof for child in node.children)
+
+        # a disproven node needs no subtree, a proven OR node only its proving child
+        if node.disproof == 0:
+            node.children = []
+        elif node.proof == 0 and node.is_or:
+            node.children = [next(child for child in node.children if child.proof == 0)]
+
+
+    def _proof_line(self, root):
+        """ returns the moves from the root of a proven tree to a position where the defender has no legal move """
+
+        line = []
+        node = root
+        while node.children:
+
+            # the attacker plays its proving move; the defender holds out longest
+            if node.is_or:
+                node = node.children[0]
+            else:
+                node = max(node.children, key=self._proof_length)
+            line.append(node.move)
+
+        return line
+
+
+    def _proof_length(self, node):
+        """ returns the number of plies to the end of a proven subtree, assuming the defender holds out longest """
+
+        if not node.children:
+            return 0
+        if node.is_or:
+            return 1 + self._proof_length(node.children[0])
+        return 1 + max(self._proof_length(child) for child in node.children)
+
+
+class SharedTranspositionTable:
+    """
+    SharedTranspositionTable: fixed-size transposition table in shared memory, read and written by every search process on a host
+
+    Each entry is two 64-bit words: (hash ^ data, data), where data packs the depth, bound, best move index and score.
+    Entries are written without locks; a reader accepts an entry only if its two words XOR back to the hash it is
+    looking for, so an entry torn by a concurrent write is treated as a miss. Tables pickle by name, so they can be
+    handed to multiprocessing workers, which attach to the same memory.
+
+    Attributes:
+        - name: the name of the shared memory block
+        - num_entries: the number of entries
+        - hits / stores: number of successful probes and of writes made by this process
+
+    Functions:
+        create(num_entries, name): creates a new table
+        attach(name): attaches to an existing table
+        probe(key): returns (depth, score, bound, best move index) for the key, or None
+        store(key, depth, score, bound, best_move_index): writes an entry unless a deeper entry for the same key is stored
+        close(): detaches this process from the table
+        unlink(): frees the shared memory (call once, from the process that created it)
+    """
+
+    EXACT = 0
+    LOWER_BOUND = 1
+    UPPER_BOUND = 2
+
+    # best move index stored when there is no best move
+    NO_MOVE = 0xFFFF
+
+    _header = struct.Struct("<8sQ")          # magic, number of entries
+    _entry = struct.Struct("<QQ")            # hash ^ data, data
+    _data = struct.Struct("<BBHf")           # depth, bound, best move index, score
+    _magic = b"LGAMETT1"
+
+
+    def __init__(self, memory):
+
+        magic, num_entries = self._header.unpack_from(memory.buf, 0)
+        if magic != self._magic:
+            raise ValueError (f"shared memory {memory.name} does not hold a transposition table")
+
+        self.memory = memory
+        self.name = memory.name
+        self.num_entries = num_entries
+        self.hits = 0
+        self.stores = 0
+
+
+    @staticmethod
+    def create(num_entries=1 << 16, name=None):
+
+        size = SharedTranspositionTable._header.size + num_entries * SharedTranspositionTable._entry.size
+        memory = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        # start from empty entries (a zero entry only matches a zero hash)
+        memory.buf[:size] = bytes(size)
+        SharedTranspositionTable._header.pack_into(memory.buf, 0, SharedTranspositionTable._magic, num_entries)
+
+        return SharedTranspositionTable(memory)
+
+
+    @staticmethod
+    def attach(name):
+
+        # only unlink() from the creating process frees the table; an attaching process must not hand it to its
+        # resource tracker, which would unlink it when the process exits (track=False exists from Python 3.13)
+        try:
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            memory = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(memory._name, "shared_memory")
+
+        return SharedTranspositionTable(memory)
+
+
+    def __reduce__(self):
+        return (SharedTranspositionTable.attach, (self.name,))
+
+
+    def _offset(self, key):
+        return self._header.size + (key % self.num_entries) * self._entry.size
+
+
+    def probe(self, key):
+
+        check, data = self._entry.unpack_from(self.memory.buf, self._offset(key))
+
+        # empty, another position, or torn by a concurrent write
+        if check ^ data != key:
+            return None
+
+        self.hits += 1
+        return self._data.unpack(data.to_bytes(8, "little"))
+
+
+    def store(self, key, depth, score, bound=EXACT, best_move_index=None):
+
+        offset = self._offset(key)
+
+        # keep a deeper result for the same position
+        check, data = self._entry.unpack_from(self.memory.buf, offset)
+        if check ^ data == key and self._data.unpack(data.to_bytes(8, "little"))[0] > depth:
+            return
+
+        if best_move_index is None or best_move_index >= self.NO_MOVE:
+            best_move_index = self.NO_MOVE
+
+        data = int.from_bytes(self._data.pack(min(max(depth, 0), 255), bound, best_move_index, score), "little")
+        self._entry.pack_into(self.memory.buf, offset, key ^ data, data)
+        self.stores += 1
+
+
+    def close(self):
+        self.memory.close()
+
+
+    def unlink(self):
+
+        # a worker started by this process shares its resource tracker, so attaching there may have dropped the
+        # registration that unlink() removes; registering again is harmless when it is still there
+        resource_tracker.register(self.memory._name, "shared_memory")
+        self.memory.unlink()
+
+
+class Evaluator:
+    """
+    Evaluator: scores positions from the grid itself, caching the features of each position by its Zobrist hash
+
+    Features, each taken for one player against the other:
+        - center: center squares (2x2 on even boards, 3x3 on odd boards) covered by the player's L piece
+        - mobility: number of legal L placements the player has
+        - neutral_blocked: number of placements the player would have if the neutral pieces were not there
+
+    Attributes:
+        - weights: dictionary mapping each feature to its weight (integers keep scores exact in the shared transposition table)
+        - win_score: the score of a position whose player to move has no legal placement
+        - cache: ByteBoundedCache mapping a position hash to the features of both players; the oldest positions are
+          evicted beyond the max_cache_bytes it was created with
+
+    Functions:
+        features(board): returns the (center, mobility, neutral_blocked) tuples of L1 and L2, in that order
+        evaluate(board, label, label_to_move): returns the score of the position for the given player
+        is_terminal(board): returns whether either player has no legal placement
+    """
+
+    # index of each player's features and of each feature within them
+    player_index = {"L1": 0, "L2": 1}
+    CENTER, MOBILITY, NEUTRAL_BLOCKED = 0, 1, 2
+
+    # center square masks, one per board size
+    _center_masks = {}
+
+
+    def __init__(self, weights=None, win_score=1000, max_cache_bytes=1 << 24):
+        self.weights = weights if weights is not None else {"center": 1, "mobility": 2, "neutral_blocked": 1}
+        self.win_score = win_score
+        self.cache = ByteBoundedCache(max_cache_bytes)
+
+
+    @staticmethod
+    def center_mask(size):
+        if size not in Evaluator._center_masks:
+            middle = range(size // 2 - 1, (size + 1) // 2 + 1)
+            Evaluator._center_masks[size] = PlacementTable.for_size(size).mask_of([(x, y) for x in middle for y in middle])
+        return Evaluator._center_masks[size]
+
+
+    def features(self, board):
+
+        position_hash = board.position_hash()
+        cached = self.cache.get(position_hash)
+        if cached is not None:
+            return cached
+
+        size = board.size
+        occupancy = board.occupancy_masks()
+        empty_mask = ((1 << size * size) - 1) & ~(occupancy["L1"] | occupancy["L2"] | occupancy["N"])
+
+        center_mask = Evaluator.center_mask(size)
+        placements = PlacementTable.for_size(size).placements
+
+        features = []
+        for label in ("L1", "L2"):
+            own_mask = occupancy[label]
+            free_mask = empty_mask | own_mask
+            free_without_neutrals_mask = free_mask | occupancy["N"]
+
+            mobility = 0
+            neutral_blocked = 0
+            for _, mask, _ in placements:
+                if mask == own_mask:
+                    continue
+                if mask & free_mask == mask:
+                    mobility += 1
+                elif mask & free_without_neutrals_mask == mask:
+                    neutral_blocked += 1
+
+            features.append((bin(own_mask & center_mask).count("1"), mobility, neutral_blocked))
+
+        features = tuple(features)
+        self.cache.put(position_hash, features, ByteBoundedCache.entry_bytes(position_hash, features, *features))
+
+        return features
+
+
+    def evaluate(self, board, label, label_to_move):
+
+        features = self.features(board)
+        own = features[self.player_index[label]]
+        opponent = features[1 - self.player_index[label]]
+
+        # the player to move loses when it has no legal placement
+        if features[self.player_index[label_to_move]][self.MOBILITY] == 0:
+            return -self.win_score if label_to_move == label else self.win_score
+
+        weights = self.weights
+        return (weights["center"] * (own[self.CENTER] - opponent[self.CENTER]) +
+                weights["mobility"] * (own[self.MOBILITY] - opponent[self.MOBILITY]) +
+                weights["neutral_blocked"] * (opponent[self.NEUTRAL_BLOCKED] - own[self.NEUTRAL_BLOCKED]))
+
+
+    def is_terminal(self, board):
+        features = self.features(board)
+        return features[0][self.MOBILITY] == 0 or features[1][self.MOBILITY] == 0
+
+
+class MinimaxAgent:
+    """
+    MinimaxAgent: represents an AI agent that uses the minimax algorithm to make moves
+
+    Attributes:
+        - name: the name of the AI agent
+        - L_piece: the L piece controlled by the AI agent
+        - depth: the depth to search in the minimax tree
+        - renderer: the renderer the agent's output goes through
+        - prover: ProofNumberSearch tried before the minimax search; a proven win is played without searching (None = off)
+        - transposition_table: SharedTranspositionTable shared with other search processes (None = off)
+        - search_path: repetition keys of the game so far and of the line being searched; reaching one again is a draw
+        - draw_score: the score of a repeated position
+        - repetition_hits: number of times the search has scored a repeated position as a draw; a node whose subtree
+          changed it has a score that depends on the path to it, and is kept out of the transposition table
+        - evaluator: the Evaluator that scores leaf positions (may be shared between agents)
+        - proof_node: the node of the proof tree being played out after a proven win (None when there is none)
+        - last_proof: the ProofResult of the proof search run for the last move (None if none ran)
+
+    Functions:
+        evaluation_function(board, label_to_move): evaluates game state to return a score
+        get_action(board, history): returns the minimax action from the current game state, given the repetition keys played so far
+        prepare_root(board, history): returns the player labels, legal moves and successors to search from, and seeds the search path
+        score_root_moves(successor_boards, depth, player_L_labels, scores): appends the score of each root move to scores
+        find_max_score(board, depth, player_L_labels, alpha, beta): returns the maximum score for the current player
+        find_min_score(board, depth, player_L_labels, alpha, beta): returns the minimum score for the opponent player
+    """
+
+    # a repeated position is a draw, scored like a position where neither player is ahead
+    draw_score = 0
+
+
+    def __init__(self, name, L_piece, depth, renderer=None, prover=None, transposition_table=None, evaluator=None):
+        
+        self.name = name
+        self.L_piece = L_piece
+        self.depth = depth
+        self.renderer = renderer if renderer is not None else Renderer()
+        self.prover = prover
+        self.transposition_table = transposition_table
+        self.search_path = set()
+        self.repetition_hits = 0
+        self.evaluator = evaluator if evaluator is not None else Evaluator()
+        self.proof_node = None
+        self.last_proof = None
+
+
+    def evaluation_function (self, board, label_to_move):
+        """
+        evaluates game state to return a score
+        """
+        # evaluate game state from this agent's side: center control, mobility and neutral blocking, against the opponent's
+        return self.evaluator.evaluate(board, self.L_piece.label, label_to_move)
+
+
+    def get_action(self, board, history=None):
+        """
+        returns the minimax action from the current game state
+        """
+
+        # play a proven win without searching
+        proven_action = self.find_proven_action(board)
+        if proven_action is not None:
+            return proven_action
+
+        player_L_labels, moves, successor_boards = self.prepare_root(board, history)
+
+        # list of scores for each move
+        scores = []
+        self.score_root_moves(successor_boards, self.depth, player_L_labels, scores)
+
+        # pick action w/ max score
+        best_score = max (scores)
+        best_action = moves[scores.index(best_score)]
+
+        # self.renderer.message("Scores for each move: %s", scores)
+        # self.renderer.message("Best action chosen: %s, Best score: %s", best_action, best_score)
+
+        return best_action
+
+
+    def prepare_root(self, board, history):
+        """
+        returns the player to L piece label mapping, the legal moves and their successor boards for a search from the
+        current game state, and seeds the search path with the repetition keys played so far
+        """
+
+        # which L piece is the max player
+        max_player_L_piece_label = self.L_piece.label
+        if max_player_L_piece_label == "L1":
+            min_player_L_piece_label = "L2"
+        elif max_player_L_piece_label == "L2":
+            min_player_L_piece_label = "L1"
+
+        else: 
+            raise ValueError (f"invalid label: {max_player_L_piece_label}")
+
+        # dictionary to map player labels to L piece labels
+        player_L_labels = {"max": max_player_L_piece_label, "min": min_player_L_piece_label}
+
+        # lines that return to a position of the game so far are draws
+        self.search_path = set(history or ())
+        self.search_path.add(board.repetition_key(player_L_labels["max"]))
+
+        # initialize list of legal moves & their successors
+        moves = board.get_legal_moves (self.L_piece)
+        successor_boards = [board.generate_successor (move, player_L_labels["max"]) for move in moves]
+
+        return player_L_labels, moves, successor_boards
+
+
+    def score_root_moves(self, successor_boards, depth, player_L_labels, scores):
+        """
+        appends the score of each root move to scores, so that the moves scored so far are kept if the search is stopped;
+        a move that cannot beat the best so far only needs to be shown no better (alpha-beta)
+        """
+
+        alpha = float('-inf')
+        for successor in successor_boards:
+            scores.append(self.find_min_score (successor, depth, player_L_labels, alpha, float('inf')))
+            alpha = max(alpha, scores[-1])
+
+
+    def find_proven_action(self, board, max_nodes=None, max_bytes=None):
+        """
+        returns the next move of a proven forced win, or None if there is no prover or no win was proven;
+        a win proven on an earlier move is played out from its proof tree without searching again
+        """
+
+        if self.prover is None:
+            return None
+
+        self.last_proof = None
+
+        # the proof tree answers every defender reply: find the one that was played
+        if self.proof_node is not None:
+            position_key = board.position_key()
+            for reply in self.proof_node.children:
+                if reply.key == position_key and reply.proof == 0 and reply.children:
+                    self.proof_node = reply.children[0]
+                    return self.proof_node.move
+            self.proof_node = None
+
+        result = self.last_proof = self.prover.prove(board, self.L_piece.label, max_nodes, max_bytes)
+        if result.status != "proven":
+            return None
+
+        self.renderer.message("%s proved a forced win in %s plies (%s nodes)", self.name, len(result.line), result.nodes)
+
+        # keep the attacker's proving move with the defender replies under it
+        self.proof_node = result.tree.children[0]
+        return self.proof_node.move
+
+
+    def find_max_score(self, board, depth, player_L_labels, alpha, beta):
+        # a position already on the game or search path is a draw; the line is not searched again
+        path_key = board.repetition_key(player_L_labels["max"])
+        if path_key in self.search_path:
+            self.repetition_hits += 1
+            return self.draw_score
+        repetition_hits = self.repetition_hits
+
+        # reuse a score found by any process sharing the transposition table, or at least its best move
+        table_key = self.table_key(board, player_L_labels["max"], True)
+        table_score, table_move_index = self.probe_table(table_key, depth, alpha, beta)
+        if table_score is not None:
+            return table_score
+
+        # check if the game is over or if the depth limit is reached
+        if depth == 0 or self.evaluator.is_terminal(board):
+            score = self.evaluation_function(board, player_L_labels["max"])
+            self.store_table(table_key, depth, score, SharedTranspositionTable.EXACT, None)
+            return score
+
+        original_alpha = alpha
+        max_score = float('-inf')
+        best_move_index = None
+        moves = board.get_legal_moves(board.L_pieces[player_L_labels["max"]])
+
+        # get the max score for each successor, best move first
+        self.search_path.add(path_key)
+        try:
+            for move_index in self.move_order(len(moves), table_move_index):
+                successor = board.generate_successor(moves[move_index], player_L_labels["max"])
+                score = self.find_min_score(successor, depth, player_L_labels, alpha, beta)
+                if score > max_score:
+                    max_score, best_move_index = score, move_index
+
+                # alpha-beta pruning
+                if max_score >= beta:
+                    break
+                alpha = max(alpha, max_score)
+        finally:
+            self.search_path.discard(path_key)
+
+        # a score that counted a repetition as a draw only holds for this path, so other searches must not reuse it
+        if self.repetition_hits == repetition_hits:
+            self.store_table(table_key, depth, max_score, self.score_bound(max_score, original_alpha, beta), best_move_index)
+
+        return max_score
+
+
+    def find_min_score(self, board, depth, player_L_labels, alpha, beta):
+
+        path_key = board.repetition_key(player_L_labels["min"])
+        if path_key in self.search_path:
+            self.repetition_hits += 1
+            return self.draw_score
+        repetition_hits = self.repetition_hits
+
+        table_key = self.table_key(board, player_L_labels["min"], False)
+        table_score, table_move_index = self.probe_table(table_key, depth, alpha, beta)
+        if table_score is not None:
+            return table_score
+
+        if depth == 0 or self.evaluator.is_terminal(board):
+            score = self.evaluation_function(board, player_L_labels["min"])
+            self.store_table(table_key, depth, score, SharedTranspositionTable.EXACT, None)
+            return score
+
+        original_beta = beta
+        min_score = float('inf')
+        best_move_index = None
+        actions = board.get_legal_moves(board.L_pieces[player_L_labels["min"]])       # agent_index = L_piece (object)
+
+        self.search_path.add(path_key)
+        try:
+            for move_index in self.move_order(len(actions), table_move_index):
+
+                successor = board.generate_successor(actions[move_index], player_L_labels["min"])  # agent_index = player_name ("AI", "AI1", etc.)
+
+                # need this for l game? this was for ghosts in pacman\
+                score = self.find_max_score(successor, depth - 1, player_L_labels, alpha, beta)
+                if score < min_score:
+                    min_score, best_move_index = score, move_index
+
+                if min_score <= alpha:
+                    break
+                beta = min(beta, min_score)
+        finally:
+            self.search_path.discard(path_key)
+
+        if self.repetition_hits == repetition_hits:
+            self.store_table(table_key, depth, min_score, self.score_bound(min_score, alpha, original_beta), best_move_index)
+
+        return min_score
+
+
+    @staticmethod
+    def move_order(num_moves, first_move_index):
+        """
+        returns the move indices to search, starting with the given best move from an earlier search when there is one
+        """
+
+        if first_move_index is None or first_move_index >= num_moves:
+            return range(num_moves)
+
+        return [first_move_index] + [index for index in range(num_moves) if index != first_move_index]
+
+
+    @staticmethod
+    def score_bound(score, alpha, beta):
+        """
+        returns what a score searched with the window (alpha, beta) tells about the node: a cutoff only gives a bound
+        """
+
+        if score >= beta:
+            return SharedTranspositionTable.LOWER_BOUND
+        if score <= alpha:
+            return SharedTranspositionTable.UPPER_BOUND
+        return SharedTranspositionTable.EXACT
+
+
+    @staticmethod
+    def bound_decides(score, bound, alpha, beta):
+        """
+        returns whether a stored score with the given bound settles a node searched with the window (alpha, beta)
+        """
+
+        return (bound == SharedTranspositionTable.EXACT or
+                (bound == SharedTranspositionTable.LOWER_BOUND and score >= beta) or
+                (bound == SharedTranspositionTable.UPPER_BOUND and score <= alpha))
+
+
+    def table_key(self, board, label_to_move, is_max_node):
+        """
+        returns the transposition table key of a search node (None when there is no table)
+        """
+
+        if self.transposition_table is None:
+            return None
+
+        # the same position is scored differently for each player to move and each node type
+        key = board.repetition_key(label_to_move)
+        if is_max_node:
+            key ^= Zobrist.for_size(board.size).max_node_key
+
+        return key
+
+
+    def probe_table(self, table_key, depth, alpha, beta):
+        """
+        returns (score, best move index) stored for the node; the score is None unless it was searched at this depth
+        or deeper and settles the node for this window, and the best move index is None if none was stored
+        """
+
+        if table_key is None:
+            return None, None
+
+        entry = self.transposition_table.probe(table_key)
+        if entry is None:
+            return None, None
+
+        stored_depth, bound, best_move_index, score = entry
+        if best_move_index == SharedTranspositionTable.NO_MOVE:
+            best_move_index = None
+
+        if stored_depth < depth or not self.bound_decides(score, bound, alpha, beta):
+            return None, best_move_index
+
+        return score, best_move_index
+
+
+    def store_table(self, table_key, depth, score, bound, best_move_index):
+        """
+        stores the score of a searched node, with what it bounds, and the index of its best move
+        """
+
+        if table_key is not None:
+            self.transposition_table.store(table_key, depth, score, bound, best_move_index)
+
+class BudgetedMinimaxAgent(MinimaxAgent):
+    """
+    BudgetedMinimaxAgent: minimax agent that searches under a SearchBudget, caching scores per position and
+    deepening one depth at a time so that it always has a move ready when a limit is reached
+
+    Attributes:
+        - budget: the SearchBudget each search runs under
+        - cache: ByteBoundedCache mapping (position key, depth, side) to (score, bound); emptied every move, bounded by the
+          part of the cache budget left to it and the proof search, and never holds a score that depends on a repetition
+        - last_report: the SearchReport of the most recent search
+
+    Functions:
+        get_action(board): returns the best action found within the budget
+        find_max_score / find_min_score: budget-checked, cached versions of the MinimaxAgent searches
+    """
+
+    # fraction of the cache budget the evaluator's feature cache may keep between moves
+    evaluator_cache_share = 0.5
+
+
+    def __init__(self, name, L_piece, depth, budget, renderer=None, prover=None, transposition_table=None, evaluator=None):
+
+        super().__init__(name, L_piece, depth, renderer, prover, transposition_table, evaluator)
+        self.budget = budget
+        self.cache = ByteBoundedCache()
+        self.last_report = None
+        self._ply = 0
+
+
+    def get_action(self, board, history=None):
+        """
+        returns the best action found within the budget; searches depth 0, 1, ... up to self.depth and keeps
+        the best action of the deepest search that finished for every root move
+
+        """
+
+        self._ply = 0
+        self.last_report = SearchReport(self.budget)
+
+        # the evaluator's feature cache is charged against the cache budget: it keeps at most its share during the search,
+        # and the score cache and the proof search tree get the rest
+        evaluator_cache = self.evaluator.cache
+        evaluator_max_bytes = evaluator_cache.max_bytes
+        self.cache = ByteBoundedCache()
+        if self.budget.max_cache_bytes is not None:
+            evaluator_cache.max_bytes = int(self.budget.max_cache_bytes * self.evaluator_cache_share)
+            if evaluator_max_bytes is not None:
+                evaluator_cache.max_bytes = min(evaluator_cache.max_bytes, evaluator_max_bytes)
+            evaluator_cache.evict(evaluator_cache.max_bytes)
+            self.cache.max_bytes = self.budget.max_cache_bytes - evaluator_cache.max_bytes
+
+        try:
+            best_action = self._budgeted_action(board, history)
+        finally:
+            evaluator_cache.max_bytes = evaluator_max_bytes
+
+        self._report_cache_bytes(self.cache.bytes)
+        self.renderer.message("%s search: %s", self.name, self.last_report)
+
+        return best_action
+
+
+    def _budgeted_action(self, board, history):
+        """ runs the proof search and then the iterative deepening search of get_action """
+
+        report = self.last_report
+
+        # play a proven win without searching; the proof search gets half the node budget and all of the score cache's
+        # memory (its tree is freed before the minimax cache is built), and its nodes count against the budget
+        max_proof_nodes = None if self.budget.max_nodes is None else self.budget.max_nodes // 2
+        proven_action = self.find_proven_action(board, max_proof_nodes, self.cache.max_bytes)
+
+        proof = self.last_proof
+        if proof is not None:
+            report.prover_nodes = proof.nodes
+            report.prover_bytes = proof.bytes
+            report.nodes += proof.nodes
+            self._report_cache_bytes(proof.bytes)
+            if proof.status == "unknown" and proof.limit in ("nodes", "bytes"):
+                report.limits_hit.add("nodes" if proof.limit == "nodes" else "cache_bytes")
+
+        if proven_action is not None:
+            return proven_action
+
+        player_L_labels, moves, successor_boards = self.prepare_root(board, history)
+        best_action = moves[0]
+
+        for depth in range(self.depth + 1):
+            scores = []
+            try:
+                self.score_root_moves(successor_boards, depth, player_L_labels, scores)
+
+            except SearchBudgetExceeded:
+                # out of nodes: fall back on the last complete depth, or on the moves scored so far if none completed
+                if report.completed_depth < 0 and scores:
+                    best_action = moves[scores.index(max(scores))]
+                break
+
+            best_action = moves[scores.index(max(scores))]
+            report.completed_depth = depth
+
+            # searching deeper cannot see past the recursion limit
+            if "depth" in report.limits_hit:
+                break
+
+        return best_action
+
+
+    def find_max_score(self, board, depth, player_L_labels, alpha, beta):
+        return self._budgeted_score(super().find_max_score, "max", board, depth, player_L_labels, alpha, beta)
+
+
+    def find_min_score(self, board, depth, player_L_labels, alpha, beta):
+        return self._budgeted_score(super().find_min_score, "min", board, depth, player_L_labels, alpha, beta)
+
+
+    def _budgeted_score(self, find_score, side, board, depth, player_L_labels, alpha, beta):
+        """ checks the budget, the search path and the cache before running the given MinimaxAgent search on a node """
+
+        budget = self.budget
+        report = self.last_report
+
+        # node budget
+        if budget.max_nodes is not None and report.nodes >= budget.max_nodes:
+            report.limits_hit.add("nodes")
+            raise SearchBudgetExceeded()
+        report.nodes += 1
+
+        # a repeated position is a draw whatever the cache holds for it
+        if board.repetition_key(player_L_labels[side]) in self.search_path:
+            self.repetition_hits += 1
+            return self.draw_score
+        repetition_hits = self.repetition_hits
+
+        key = (board.position_key(), depth, side)
+        cached = self.cache.get(key)
+        if cached is not None and self.bound_decides(cached[0], cached[1], alpha, beta):
+            report.cache_hits += 1
+            return cached[0]
+
+        # recursion budget: evaluate the node as if the search depth had run out
+        search_depth = depth
+        if budget.max_depth is not None and self._ply >= budget.max_depth:
+            report.limits_hit.add("depth")
+            search_depth = 0
+
+        self._ply += 1
+        report.max_ply = max(report.max_ply, self._ply)
+        try:
+            score = find_score(board, search_depth, player_L_labels, alpha, beta)
+        finally:
+            self._ply -= 1
+
+        # a score that counted a repetition as a draw only holds for this path
+        if self.repetition_hits == repetition_hits:
+            self._cache_score(key, score, self.score_bound(score, alpha, beta))
+
+        return score
+
+
+    def _cache_score(self, key, score, bound):
+        """ stores a score, evicting the oldest entries to stay within the cache budget """
+
+        if not self.cache.put(key, (score, bound), ByteBoundedCache.entry_bytes(key, key[0], score)):
+            self.last_report.limits_hit.add("cache_bytes")
+        self._report_cache_bytes(self.cache.bytes)
+
+
+    def _report_cache_bytes(self, working_bytes):
+        """ records the peak memory use of the score cache or proof tree together with the evaluator's feature cache """
+
+        report = self.last_report
+        evaluator_bytes = self.evaluator.cache.bytes
+        report.evaluator_bytes = max(report.evaluator_bytes, evaluator_bytes)
+        report.cache_bytes = max(report.cache_bytes, working_bytes + evaluator_bytes)
+
+
+class Game:
+
+    def __init__(self, mode='human_vs_human', depth=0, renderer=None, size=4, num_neutrals=2, fast_engine=False, budget=None, prover=None,
+                 transposition_table=None, repetition_limit=3, max_turns=500):
+        
+        self.mode = mode
+        self.renderer = renderer if renderer is not None else Renderer()
+        self.board = Board(size, fast_engine)
+        self.board.init_board()
+        self.board.init_variant_state(num_neutrals)
+        self.current_player_index = 0
+        self.players = []
+
+        # the game is drawn when a position (with the same player to move) occurs repetition_limit times; None = never
+        self.repetition_limit = repetition_limit
+        self.position_history = {}
+
+        # the game is also drawn after max_turns turns without a result (the AI players avoid repeating positions,
+        # so on larger boards the repetition rule alone may never end a game); None = never
+        self.max_turns = max_turns
+        self.turns = 0
+
+        # AI players share one evaluator (and its feature cache) and search under the budget when one is given
+        evaluator = Evaluator()
+
+        def make_agent(name, L_piece):
+            if budget is not None:
+                return BudgetedMinimaxAgent(name, L_piece, depth, budget, self.renderer, prover, transposition_table, evaluator)
+            return MinimaxAgent(name, L_piece, depth, self.renderer, prover, transposition_table, evaluator)
+
+
+        if self.mode == 'human_vs_human':
+            self.players = [
+                Player("player1", self.board.L_pieces["L1"], self.renderer),
+                Player("player2", self.board.L_pieces["L2"], self.renderer)
+            ]
+        elif self.mode == 'human_vs_ai':
+            self.players = [
+                Player("human", self.board.L_pieces["L1"], self.renderer),
+                make_agent("AI", self.board.L_pieces["L2"])
+            ]
+        elif self.mode == 'ai_vs_ai':
+            self.players = [
+                make_agent("AI1", self.board.L_pieces["L1"]),
+                make_agent("AI2", self.board.L_pieces["L2"])
+            ]
+        else:
+            raise ValueError("Invalid game mode. Choose from 'human_vs_human', 'human_vs_ai', or 'ai_vs_ai'.")
+
+        self.record_position()
+
+
+    def switch_player(self):
         self.current_player_index = 1 - self.current_player_index
 
     # returns the current player object
@@ -733,7 +2228,7 @@ class Game:
         """
         current_player = self.get_current_player()
 
-        print (f"{current_player.name}'s turn.")
+        self.renderer.message("%s's turn.", current_player.name)
 
         # if current player is a human, make a move
         if isinstance(current_player, Player):
@@ -741,7 +2236,7 @@ class Game:
         
         # if current player is AI, get the maximizing action and apply it
         elif isinstance(current_player, MinimaxAgent):
-            action = current_player.get_action(self.board)
+            action = current_player.get_action(self.board, self.position_history)
             self.apply_action(current_player, action)
 
     def apply_action(self, current_player, action):
@@ -767,7 +2262,7 @@ class Game:
             new_neutral_x, new_neutral_y = new_neutral_coordinate
 
 
-            self.board.display_board()
+            self.board.display_board(self.renderer)
 
 
             # Clear the neutral piece to move from the board
@@ -778,11 +2273,22 @@ class Game:
 
         # Update and display the board after the move
         self.board.update_grid()
-        print("Updated board after move:")
-        self.board.display_board()
+        self.renderer.message("Updated board after move:")
+        self.board.display_board(self.renderer)
 
         
 
+    def record_position(self):
+        """
+        adds the current position to the game history; returns True if it has now occurred repetition_limit times
+        """
+
+        key = self.board.repetition_key(self.get_current_player().L_piece.label)
+        self.position_history[key] = self.position_history.get(key, 0) + 1
+
+        return self.repetition_limit is not None and self.position_history[key] >= self.repetition_limit
+
+
     def is_game_over(self):
         """
         Determines if the game is over by checking if the current player has no legal moves.
@@ -796,10 +2302,182 @@ class Game:
         while not self.is_game_over():
             self.play_turn()
             self.switch_player()
+            self.turns += 1
+
+            if self.record_position():
+                self.renderer.message("Game drawn: the same position occurred %s times.", self.repetition_limit)
+                self.renderer.flush()
+                return
+
+            if self.max_turns is not None and self.turns >= self.max_turns:
+                self.renderer.message("Game drawn: no result after %s turns.", self.max_turns)
+                self.renderer.flush()
+                return
+
+            # one write per turn for buffered renderers
+            self.renderer.flush()
 
         # fix winner name
         current_player = self.get_current_player()
-        print ( f"Game over! {current_player.name} wins!")
+        self.renderer.message("Game over! %s wins!", current_player.name)
+        self.renderer.flush()
+
+class Benchmark:
+    """
+        Benchmark: timing runs for the move generation engines
+
+        Functions:
+            move_generation(variants, repeats, max_successors, renderer): times reference and fast move generation, and
+            successor generation per move, on the starting position of each variant
+    """
+
+    @staticmethod
+    def move_generation(variants=((4, 2), (5, 2), (5, 3), (6, 3), (6, 4), (7, 4), (8, 4), (8, 24), (8, 48)), repeats=5,
+                        max_successors=500, renderer=None):
+
+        if renderer is None:
+            renderer = Renderer()
+
+        renderer.message("%-6s %-9s %-6s %-8s %-7s %-12s %-12s %-12s %-12s", "size", "neutrals", "free", "L moves", "moves",
+                         "ref moves ms", "fast moves ms", "ref succ us", "fast succ us")
+
+        for size, num_neutrals in variants:
+            board = Board(size)
+            board.init_board()
+            board.init_variant_state(num_neutrals)
+            L_piece = board.L_pieces["L1"]
+
+            # generating every legal move of the starting position, then successors for up to max_successors of them
+            move_timings = []
+            successor_timings = []
+            for get_legal_moves, generate_successor in ((board.get_legal_moves_reference, board.generate_successor_reference),
+                                                        (board.get_legal_moves_fast, board.generate_successor_fast)):
+                start = time.perf_counter()
+                for _ in range(repeats):
+                    moves = get_legal_moves(L_piece)
+                move_timings.append((time.perf_counter() - start) * 1000 / repeats)
+
+                sample = moves[:max_successors]
+                start = time.perf_counter()
+                for move in sample:
+                    generate_successor(move, L_piece.label)
+                successor_timings.append((time.perf_counter() - start) * 1000000 / max(len(sample), 1))
+
+            num_free = sum(row.count(".") for row in board.game_state)
+            num_L_moves = len(set(move[0] for move in moves))
+            renderer.message("%-6s %-9s %-6s %-8s %-7s %-12.2f %-12.2f %-12.1f %-12.1f", f"{size}x{size}", num_neutrals, num_free,
+                             num_L_moves, len(moves), move_timings[0], move_timings[1], successor_timings[0], successor_timings[1])
+
+        renderer.flush()
+
+
+class EquivalenceHarness:
+    """
+        EquivalenceHarness: checks that the fast engine produces exactly the same legal moves and successors as the reference
+        engine on every position reachable from the starting position, and times both engines per position class
+
+        A position is classed by the number of distinct L moves the player to move has.
+
+        Functions:
+            run(size, num_neutrals, max_positions, renderer): checks every reachable position and returns the list of mismatches
+            board_signature(board): returns everything about a board that both engines must agree on, including its cached
+                hash and the hash recomputed from the grid
+    """
+
+    @staticmethod
+    def run(size=4, num_neutrals=2, max_positions=None, renderer=None):
+
+        if renderer is None:
+            renderer = Renderer()
+
+        start_board = Board(size)
+        start_board.init_board()
+        start_board.init_variant_state(num_neutrals)
+
+        # hash the start so that every successor's hash is updated incrementally and can be checked
+        start_board.position_hash()
+
+        other_label = {"L1": "L2", "L2": "L1"}
+
+        # breadth-first walk over (position, player to move)
+        queue = deque([(start_board, "L1")])
+        seen = {(start_board.position_key(), "L1")}
+        classes = {}        # class -> [positions, reference seconds, fast seconds]
+        mismatches = []
+        positions = 0
+
+        while queue and (max_positions is None or positions < max_positions):
+            board, label = queue.popleft()
+            L_piece = board.L_pieces[label]
+            positions += 1
+
+            start = time.perf_counter()
+            reference_moves = board.get_legal_moves_reference(L_piece)
+            reference_successors = [board.generate_successor_reference(move, label) for move in reference_moves]
+            reference_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            fast_moves = board.get_legal_moves_fast(L_piece)
+            fast_successors = [board.generate_successor_fast(move, label) for move in fast_moves]
+            fast_time = time.perf_counter() - start
+
+            # compare the move lists, then the successors move by move
+            if fast_moves != reference_moves:
+                mismatches.append((board.position_key(), label, "moves"))
+            else:
+                for move, reference_successor, fast_successor in zip(reference_moves, reference_successors, fast_successors):
+                    fast_signature = EquivalenceHarness.board_signature(fast_successor)
+                    if fast_signature != EquivalenceHarness.board_signature(reference_successor):
+                        mismatches.append((board.position_key(), label, move))
+
+                    # the incrementally updated hash must match a hash of the whole grid
+                    elif fast_signature[3] != fast_signature[4]:
+                        mismatches.append((board.position_key(), label, move, "hash"))
+
+                    # and so must the incrementally updated occupancy masks
+                    elif fast_successor.occupancy is not None:
+                        incremental_occupancy = fast_successor.occupancy
+                        fast_successor.occupancy = None
+                        if incremental_occupancy != fast_successor.occupancy_masks():
+                            mismatches.append((board.position_key(), label, move, "occupancy"))
+
+            position_class = len(set(move[0] for move in reference_moves))
+            totals = classes.setdefault(position_class, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += reference_time
+            totals[2] += fast_time
+
+            for successor in reference_successors:
+                successor_key = (successor.position_key(), other_label[label])
+                if successor_key not in seen:
+                    seen.add(successor_key)
+                    queue.append((successor, other_label[label]))
+
+        renderer.message("%-9s %-10s %-14s %-14s %-8s", "L moves", "positions", "reference ms", "fast ms", "speedup")
+        for position_class in sorted(classes):
+            count, reference_time, fast_time = classes[position_class]
+            renderer.message("%-9s %-10s %-14.3f %-14.3f %-8.1f", position_class, count, reference_time * 1000 / count,
+                             fast_time * 1000 / count, reference_time / fast_time if fast_time else float('inf'))
+
+        complete = "all" if not queue else "first"
+        renderer.message("checked %s %s reachable positions: %s mismatches", complete, positions, len(mismatches))
+        for mismatch in mismatches[:10]:
+            renderer.message("mismatch: %s", mismatch)
+        renderer.flush()
+
+        return mismatches
+
+
+    @staticmethod
+    def board_signature(board):
+        return (
+            board.game_state,
+            sorted((label, piece.coordinate, piece.orientation) for label, piece in board.L_pieces.items()),
+            sorted((label, piece.coordinate) for label, piece in board.neutral_pieces.items()),
+            board.zobrist_hash,
+            Zobrist.for_size(board.size).hash_state(board.game_state)
+        )
+
 
 class Menu:
     @staticmethod
@@ -823,6 +2501,16 @@ class Menu:
                 print("Invalid input. Please enter a number (1, 2, or 3).")
 
 if __name__ == "__main__":
+
+    # python L-game.py --benchmark
+    if "--benchmark" in sys.argv[1:]:
+        Benchmark.move_generation()
+        sys.exit()
+
+    # python L-game.py --equivalence
+    if "--equivalence" in sys.argv[1:]:
+        sys.exit(1 if EquivalenceHarness.run() else 0)
+
     Menu.display_menu()
     mode_choice = Menu.get_mode()
 
@@ -0,0 +1,28 @@
+import importlib.util
+import os
+import sys
+import unittest
+
+
+GAME_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "L-game.py")
+
+# L-game.py is not an importable module name, so it is loaded from its path
+spec = importlib.util.spec_from_file_location("l_game", GAME_PATH)
+l_game = importlib.util.module_from_spec(spec)
+sys.modules["l_game"] = l_game
+spec.loader.exec_module(l_game)
+
+
+class GameTest(unittest.TestCase):
+
+    def test_ai_vs_ai_game_is_drawn_after_max_turns(self):
+        game = l_game.Game("ai_vs_ai", 0, l_game.NullRenderer(), size=5, num_neutrals=3, fast_engine=True, max_turns=6)
+
+        game.play()
+
+        self.assertEqual(game.turns, 6)
+        self.assertFalse(game.is_game_over())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import importlib.util
+import os
+import sys
+import unittest
+
+
+GAME_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "L-game.py")
+
+# L-game.py is not an importable module name, so it is loaded from its path
+spec = importlib.util.spec_from_file_location("l_game", GAME_PATH)
+l_game = importlib.util.module_from_spec(spec)
+sys.modules["l_game"] = l_game
+spec.loader.exec_module(l_game)
+
+
+def make_board(L1_coordinate, L1_orientation, L2_coordinate, L2_orientation, neutral_positions):
+    board = l_game.Board()
+    board.init_board()
+    board.init_game_state(L1_coordinate, L1_orientation, L2_coordinate, L2_orientation, neutral_positions)
+    return board
+
+
+class ProofNumberSearchTest(unittest.TestCase):
+
+    def setUp(self):
+        # L1 to move wins in one: moving to (1, 1) S and the neutral from (3, 3) to (1, 3) leaves L2 no placement
+        self.win_in_one = make_board((1, 3), "FW", (0, 0), "FE", [(2, 0), (3, 3)])
+
+
+    def test_win_in_one_is_proven_at_depth_one(self):
+        result = l_game.ProofNumberSearch(max_depth=1).prove(self.win_in_one, "L1")
+
+        self.assertEqual(result.status, "proven")
+        self.assertEqual(len(result.line), 1)
+
+
+    def test_proven_line_leaves_the_defender_without_a_move(self):
+        result = l_game.ProofNumberSearch().prove(self.win_in_one, "L1")
+        self.assertEqual(result.status, "proven")
+
+        board = self.win_in_one
+        labels = ["L1", "L2"]
+        for ply, move in enumerate(result.line):
+            label = labels[ply % 2]
+            self.assertIn(move, board.get_legal_moves(board.L_pieces[label]))
+            board = board.generate_successor(move, label)
+
+        defender_label = labels[len(result.line) % 2]
+        self.assertEqual(defender_label, "L2")
+        self.assertEqual(board.get_legal_moves(board.L_pieces[defender_label]), [])
+
+
+    def test_attacker_without_a_move_is_disproven(self):
+        move = l_game.ProofNumberSearch().prove(self.win_in_one, "L1").line[0]
+        board = self.win_in_one.generate_successor(move, "L1")
+
+        result = l_game.ProofNumberSearch().prove(board, "L2")
+
+        self.assertEqual(result.status, "disproven")
+        self.assertEqual(result.line, [])
+
+
+    def test_no_win_within_max_depth_is_unknown(self):
+        board = make_board((1, 3), "E", (2, 0), "W", [(0, 0), (3, 3)])
+
+        result = l_game.ProofNumberSearch(max_depth=1).prove(board, "L1")
+
+        self.assertEqual(result.status, "unknown")
+        self.assertEqual(result.limit, "depth")
+
+
+    def test_agent_plays_the_proven_move(self):
+        board = self.win_in_one
+        prover = l_game.ProofNumberSearch(max_depth=1)
+        agent = l_game.MinimaxAgent("AI", board.L_pieces["L1"], 1, l_game.NullRenderer(), prover)
+
+        action = agent.find_proven_action(board)
+
+        self.assertEqual(agent.last_proof.status, "proven")
+        self.assertEqual(action, agent.last_proof.line[0])
+        successor = board.generate_successor(action, "L1")
+        self.assertEqual(successor.get_legal_moves(successor.L_pieces["L2"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import importlib.util
+import multiprocessing
+import os
+import subprocess
+import sys
+import unittest
+
+
+GAME_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "L-game.py")
+
+# L-game.py is not an importable module name, so it is loaded from its path
+spec = importlib.util.spec_from_file_location("l_game", GAME_PATH)
+l_game = importlib.util.module_from_spec(spec)
+sys.modules["l_game"] = l_game
+spec.loader.exec_module(l_game)
+
+
+# run by a separate python process: attach, read the parent's entry, add one of its own, detach and exit
+WORKER_SCRIPT = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("l_game", sys.argv[1])
+l_game = importlib.util.module_from_spec(spec)
+sys.modules["l_game"] = l_game
+spec.loader.exec_module(l_game)
+
+table = l_game.SharedTranspositionTable.attach(sys.argv[2])
+assert table.probe(1234) is not None
+table.store(5678, 3, -2.0)
+table.close()
+"""
+
+
+def spawned_worker(table):
+    # the table arrives pickled by name and attaches in the child
+    assert table.probe(1234) is not None
+    table.store(9012, 1, 4.0)
+    table.close()
+
+
+class SharedTranspositionTableTest(unittest.TestCase):
+
+    def setUp(self):
+        self.table = l_game.SharedTranspositionTable.create(1024)
+        self.table.store(1234, 2, 1.5, l_game.SharedTranspositionTable.EXACT, 7)
+
+
+    def tearDown(self):
+        self.table.close()
+        self.table.unlink()
+
+
+    def test_store_and_probe(self):
+        self.assertEqual(self.table.probe(1234), (2, l_game.SharedTranspositionTable.EXACT, 7, 1.5))
+        self.assertIsNone(self.table.probe(4321))
+
+
+    def test_separate_process_attach_does_not_free_the_table(self):
+        result = subprocess.run([sys.executable, "-c", WORKER_SCRIPT, GAME_PATH, self.table.name], capture_output=True, text=True)
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertNotIn("leaked shared_memory", result.stderr)
+
+        # the table outlives the worker and holds what it wrote
+        reattached = l_game.SharedTranspositionTable.attach(self.table.name)
+        self.assertEqual(reattached.probe(5678)[3], -2.0)
+        reattached.close()
+
+
+    def test_spawned_worker_attach_does_not_free_the_table(self):
+        process = multiprocessing.get_context("spawn").Process(target=spawned_worker, args=(self.table,))
+        process.start()
+        process.join()
+
+        self.assertEqual(process.exitcode, 0)
+        self.assertEqual(self.table.probe(9012)[3], 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()